@@ -7,30 +7,78 @@ Rules:
 - No more than 20 tickets total can be sold.
 - After each purchase, the program displays how many tickets remain.
 - The program repeats until all tickets are sold, then displays the total number of total_buyers.
+- Optionally, every purchase is journaled so a crash does not lose the sale
+  (see ticket_purchase_journal.py).
+- Optionally, live sale numbers are published to shared memory for
+  operations to scrape (see sale_telemetry.py).
 """
 
+import time
+from typing import Optional, Tuple
+
+from sale_telemetry import SaleTelemetry
+from ticket_purchase_journal import PurchaseJournal
+
 TOTAL_TICKETS = 10
 MAX_PER_BUYER = 4
 
 
-def request_tickets(tickets_remaining: int) -> int:
+def check_ticket_request(raw: str, tickets_remaining: int) -> Tuple[Optional[int], str, str]:
+    """
+    Validate one ticket request without prompting the user.
+
+    Parameters:
+        raw (str): The buyer's input as a string.
+        tickets_remaining (int): The number of tickets currently available.
+
+    Variables:
+        requested (int): The requested number of tickets, once parsed.
+
+    Logic:
+        1. Validate that the input is an integer.
+        2. Validate that the number is between 1 and MAX_PER_BUYER.
+        3. Validate that the number does not exceed tickets_remaining.
+        4. Return the validated value, or None with the rejection reason
+           ("non_integer", "out_of_range", "exceeds_remaining") and message.
+
+    Return:
+        tuple[int | None, str, str]: (requested, "", "") if valid,
+            else (None, reason, error message).
+    """
+    try:
+        requested = int(raw)
+    except ValueError:
+        return None, "non_integer", "Please enter a whole number (example: 1, 2, 3, 4)."
+
+    if requested < 1 or requested > MAX_PER_BUYER:
+        return None, "out_of_range", f"Each buyer can purchase 1 to {MAX_PER_BUYER} tickets."
+    if requested > tickets_remaining:
+        return (None, "exceeds_remaining",
+                f"Only {tickets_remaining} ticket(s) remain. Please enter {tickets_remaining} or less.")
+    return requested, "", ""
+
+
+def request_tickets(tickets_remaining: int, telemetry: Optional[SaleTelemetry] = None) -> int:
     """
     Prompt the user for how many tickets they want to buy and validate the input.
 
     Parameters:
         tickets_remaining (int): The number of tickets currently available.
+        telemetry (SaleTelemetry | None): Where to count validations, if enabled.
 
     Variables:
         raw (str): The user's input as a string.
-        requested (int): The validated number of tickets the buyer wants.
+        requested (int | None): The validated number of tickets, or None if invalid.
+        reason (str): Why the input was rejected ("" if valid).
+        error (str): The message explaining why the input was rejected.
+        started (int): Clock reading taken before validation, in nanoseconds.
 
     Logic:
         1. Loop until a valid request is entered.
         2. Ask the user for a number of tickets.
-        3. Validate that the input is an integer.
-        4. Validate that the number is between 1 and 4.
-        5. Validate that the number does not exceed tickets_remaining.
-        6. Return the validated requested value.
+        3. Validate the input with check_ticket_request, timing it for telemetry.
+        4. Display the error message and ask again if it is invalid.
+        5. Return the validated requested value.
 
     Return:
         int: The number of tickets the buyer will purchase (1-4, and <= tickets_remaining).
@@ -38,16 +86,13 @@ def request_tickets(tickets_remaining: int) -> int:
     while True:
         raw = input(f"Enter the number of tickets you want to purchase (1-{MAX_PER_BUYER}): "
                     f"Tickets remaining: {tickets_remaining} >>> ").strip()
-        try:
-            requested = int(raw)
-        except ValueError:
-            print("Please enter a whole number (example: 1, 2, 3, 4).")
-            continue
-
-        if requested < 1 or requested > MAX_PER_BUYER:
-            print(f"Each buyer can purchase 1 to {MAX_PER_BUYER} tickets.")
-        elif requested > tickets_remaining:
-            print(f"Only {tickets_remaining} ticket(s) remain. Please enter {tickets_remaining} or less.")
+        started = time.perf_counter_ns()
+        requested, reason, error = check_ticket_request(raw, tickets_remaining)
+        if telemetry is not None:
+            telemetry.record_validation(reason, time.perf_counter_ns() - started)
+
+        if requested is None:
+            print(error)
         else:
             return requested
 
@@ -74,45 +119,87 @@ def apply_purchase(tickets_remaining: int, requested: int) -> int:
     return updated_remaining
 
 
-def main() -> None:
+def main(journal_dir: Optional[str] = None, telemetry_name: Optional[str] = None) -> None:
     """
     Control the ticket pre-sale loop until tickets are sold out, then report totals.
 
     Parameters:
-     def main() -> None:
+        journal_dir (str | None): Folder for the purchase journal. When given,
+            the counters are recovered from it on start and every purchase
+            is recorded to it before the next buyer is served.
+        telemetry_name (str | None): Shared-memory name for live metrics.
+            When given, run "python sale_telemetry.py <name>" to watch the sale.
 
     Variables:
         tickets_remaining (int): Accumulator that tracks the tickets still available.
         total_buyers (int): Accumulator that counts how many total_buyers completed a purchase.
         requested (int): Tickets requested for the current buyer.
+        journal (PurchaseJournal | None): The purchase journal, if enabled.
+        telemetry (SaleTelemetry | None): The live metrics block, if enabled.
 
     Logic:
-        1. Initialize tickets_remaining to TOTAL_TICKETS and total_buyers to 0.
+        1. Initialize tickets_remaining to TOTAL_TICKETS and total_buyers to 0,
+           or recover both from the journal when journal_dir is given.
         2. Loop while tickets_remaining > 0:
             a. Call request_tickets to get a validated ticket request.
             b. Call apply_purchase to update tickets_remaining.
             c. Increment total_buyers by 1.
-            d. Display the updated number of remaining tickets.
-        3. After the loop ends, display the total number of total_buyers.
+            d. Record the purchase in the journal and telemetry, if enabled.
+            e. Display the updated number of remaining tickets.
+        3. Close the journal and telemetry, even if the loop ends early.
+        4. After the loop ends, display the total number of total_buyers.
 
     Return:
         None
     """
     tickets_remaining = TOTAL_TICKETS
-    total_buyers= 1
-
-    print("Cinema Ticket Pre-Sale")
-    print("-" * 22)
-
-    while tickets_remaining > 0:
-        requested = request_tickets(tickets_remaining)
-        tickets_remaining = apply_purchase(tickets_remaining, requested)
-        total_buyers += 1  # accumulator (count total_buyers)
-
-        if tickets_remaining > 0:
-            print(f"Purchase complete! Tickets remaining: {tickets_remaining}\n")
-        else:
-            print("Purchase complete! Tickets remaining: 0\n")
+    total_buyers = 0
+    journal = None
+
+    if journal_dir is not None:
+        # Resume from the last durable state instead of starting over.
+        # batch_size=1 fsyncs each purchase before the next buyer is served:
+        # this loop has a single writer, so there is nothing to group, and a
+        # confirmed sale must survive a crash. Group commit pays off for
+        # multi-writer callers such as the load generator.
+        journal = PurchaseJournal(journal_dir, tickets_remaining, total_buyers, batch_size=1)
+        tickets_remaining = journal.tickets_remaining
+        total_buyers = journal.total_buyers
+
+    telemetry = None
+    try:
+        if telemetry_name is not None:
+            telemetry = SaleTelemetry(telemetry_name, create=True)
+            telemetry.set_tickets_remaining(tickets_remaining)
+
+        print("Cinema Ticket Pre-Sale")
+        print("-" * 22)
+
+        while tickets_remaining > 0:
+            requested = request_tickets(tickets_remaining, telemetry)
+            tickets_remaining = apply_purchase(tickets_remaining, requested)
+            total_buyers += 1  # accumulator (count total_buyers)
+
+            if journal is not None:
+                journal.record_purchase(requested)
+            if telemetry is not None:
+                telemetry.record_purchase(requested, tickets_remaining)
+
+            if tickets_remaining > 0:
+                print(f"Purchase complete! Tickets remaining: {tickets_remaining}\n")
+            else:
+                print("Purchase complete! Tickets remaining: 0\n")
+    finally:
+        # Release the journal file and the shared-memory block even if the
+        # sale ends early (EOF, Ctrl-C), so the next run can start cleanly.
+        # The nested finally frees the block even if the journal's last
+        # commit fails.
+        try:
+            if journal is not None:
+                journal.close()
+        finally:
+            if telemetry is not None:
+                telemetry.close()
 
     print(f"Sold out! Total number of total_buyers: {total_buyers}")
 
@@ -15,7 +15,8 @@ Program Description:
 from __future__ import annotations
 
 import re
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Pattern, Tuple
 
 
 TRIGGERS: List[str] = [
@@ -153,6 +154,36 @@ def get_email_message_from_user() -> str:
     return message
 
 
+@lru_cache(maxsize=None)
+def compile_trigger_pattern(trigger: str) -> Pattern[str]:
+    """
+    Brief description:
+        Build (once per trigger) the regex that matches a trigger phrase.
+
+    Parameters (name: type):
+        trigger (str): One trigger word or phrase to search for.
+
+    Variables (name: type):
+        tokens (list[str]): Words in the normalized trigger phrase.
+        pattern (str): Regex pattern used for whole-word/phrase matching.
+
+    Logical steps:
+        1. Normalize the trigger and split it into tokens (words).
+        2. Build a whole-word/phrase regex pattern using token boundaries.
+        3. Compile and return it; the result is cached for later calls.
+
+    Return:
+        Pattern[str]: The compiled trigger pattern.
+    """
+    # Split the trigger into individual words for phrase matching.
+    tokens = normalize(trigger).split()
+
+    # Match the full phrase with flexible whitespace between tokens.
+    pattern = r"\b" + r"\s+".join(re.escape(t) for t in tokens) + r"\b"
+
+    return re.compile(pattern, flags=re.IGNORECASE)
+
+
 def count_trigger_occurrences(message: str, trigger: str) -> int:
     """
     Brief description:
@@ -163,48 +194,53 @@ def count_trigger_occurrences(message: str, trigger: str) -> int:
         trigger (str): One trigger word or phrase to search for.
 
     Variables (name: type):
-        normalized_message (str): Normalized message text.
-        normalized_trigger (str): Normalized trigger text.
-        tokens (list[str]): Words in the trigger phrase.
-        pattern (str): Regex pattern used for whole-word/phrase matching.
-        matches (list[str]): List of matched occurrences.
+        None
 
     Logical steps:
-        1. Normalize the message and trigger.
-        2. Split the trigger into tokens (words).
-        3. Build a whole-word/phrase regex pattern using token boundaries.
-        4. Find all matches in the message.
-        5. Return the number of matches.
+        1. Normalize the message.
+        2. Count the trigger in the normalized text.
+        3. Return the number of matches.
 
     Return:
         int: The number of occurrences of the trigger in the message.
     """
-    # Normalize both strings so matching is consistent.
-    normalized_message = normalize(message)
-    normalized_trigger = normalize(trigger)
+    # Normalize the message so matching is consistent.
+    return count_normalized_occurrences(normalize(message), trigger)
 
-    # Split the trigger into individual words for phrase matching.
-    tokens = normalized_trigger.split()
 
-    # Match the full phrase with flexible whitespace between tokens.
-    pattern = r"\b" + r"\s+".join(re.escape(t) for t in tokens) + r"\b"
+def count_normalized_occurrences(normalized_message: str, trigger: str) -> int:
+    """
+    Brief description:
+        Count a trigger in text that has already been normalized.
 
-    # Find all occurrences of the trigger in the message.
-    matches = re.findall(pattern, normalized_message, flags=re.IGNORECASE)
+    Parameters (name: type):
+        normalized_message (str): Message text that has been through normalize().
+        trigger (str): One trigger word or phrase to search for.
 
-    return len(matches)
+    Variables (name: type):
+        None
 
+    Logical steps:
+        1. Find all matches of the trigger's compiled pattern.
+        2. Return the number of matches.
 
-def scan_message_for_spam(
-    message: str,
+    Return:
+        int: The number of occurrences of the trigger in the message.
+    """
+    # The caller normalizes once, so this is only the regex search.
+    return len(compile_trigger_pattern(trigger).findall(normalized_message))
+
+
+def scan_normalized_message(
+    normalized_message: str,
     triggers: List[str],
 ) -> Tuple[int, Dict[str, int]]:
     """
     Brief description:
-        Scan a message for all triggers and calculate a spam score.
+        Scan already-normalized text for all triggers and calculate a spam score.
 
     Parameters (name: type):
-        message (str): The email message entered by the user.
+        normalized_message (str): Message text that has been through normalize().
         triggers (list[str]): The list of trigger words/phrases.
 
     Variables (name: type):
@@ -216,7 +252,7 @@ def scan_message_for_spam(
     Logical steps:
         1. Initialize score to 0 and found to an empty dictionary.
         2. Loop through each trigger in triggers.
-        3. Count occurrences of the trigger in the message.
+        3. Count occurrences of the trigger in the normalized message.
         4. If count > 0, store it and add to score.
         5. Return score and found.
 
@@ -229,7 +265,7 @@ def scan_message_for_spam(
 
     for trigger in triggers:
         # Count occurrences so repeated spam wording increases the score.
-        count = count_trigger_occurrences(message, trigger)
+        count = count_normalized_occurrences(normalized_message, trigger)
 
         # Only keep triggers that actually appear in the message.
         if count > 0:
@@ -239,6 +275,33 @@ def scan_message_for_spam(
     return score, found
 
 
+def scan_message_for_spam(
+    message: str,
+    triggers: List[str],
+) -> Tuple[int, Dict[str, int]]:
+    """
+    Brief description:
+        Scan a message for all triggers and calculate a spam score.
+
+    Parameters (name: type):
+        message (str): The email message entered by the user.
+        triggers (list[str]): The list of trigger words/phrases.
+
+    Variables (name: type):
+        None
+
+    Logical steps:
+        1. Normalize the message once.
+        2. Scan the normalized text with scan_normalized_message.
+        3. Return the score and found triggers.
+
+    Return:
+        tuple[int, dict[str, int]]: (spam score, triggers found with counts)
+    """
+    # Normalize once here instead of once per trigger.
+    return scan_normalized_message(normalize(message), triggers)
+
+
 def rate_spam_likelihood(score: int) -> str:
     """
     Brief description:
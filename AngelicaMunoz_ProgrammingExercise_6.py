@@ -18,6 +18,11 @@ PHONE_PATTERN = r"^\(\d{3}\) \d{3}-\d{4}$"
 SSN_PATTERN = r"^\d{3}-\d{2}-\d{4}$"
 ZIP_PATTERN = r"^\d{5}(-\d{4})?$"
 
+# Compile once so validating many records skips the regex cache lookup.
+PHONE_REGEX = re.compile(PHONE_PATTERN)
+SSN_REGEX = re.compile(SSN_PATTERN)
+ZIP_REGEX = re.compile(ZIP_PATTERN)
+
 
 def validate_phone_number(phone_number: str) -> bool:
     """
@@ -40,7 +45,7 @@ def validate_phone_number(phone_number: str) -> bool:
         bool: True if valid, otherwise False.
     """
     # Check for the format (123) 456-7890.
-    match_found = bool(re.fullmatch(PHONE_PATTERN, phone_number))
+    match_found = bool(PHONE_REGEX.fullmatch(phone_number))
     return match_found
 
 
@@ -65,7 +70,7 @@ def validate_social_security_number(ssn: str) -> bool:
         bool: True if valid, otherwise False.
     """
     # Check for the format 123-45-6789.
-    match_found = bool(re.fullmatch(SSN_PATTERN, ssn))
+    match_found = bool(SSN_REGEX.fullmatch(ssn))
     return match_found
 
 
@@ -91,7 +96,7 @@ def validate_zip_code(zip_code: str) -> bool:
         bool: True if valid, otherwise False.
     """
     # Accept either 12345 or 12345-6789.
-    match_found = bool(re.fullmatch(ZIP_PATTERN, zip_code))
+    match_found = bool(ZIP_REGEX.fullmatch(zip_code))
     return match_found
 
 
@@ -0,0 +1,687 @@
+"""
+COP2373 Tool Launcher
+
+Program Description:
+    One entry point for every tool in this project. The launcher imports
+    only the tool that was asked for, when it is asked for. For scheduled
+    (non-interactive) calls it hands the work to a pre-warmed worker
+    process that already has every tool imported, so short calls skip the
+    import cost and most of the interpreter start-up. The worker forks a
+    fresh child per call, so calls cannot leak state into each other.
+
+Usage:
+    python launcher.py serve                  # start the warm worker
+    python launcher.py stop                   # stop it
+    python launcher.py validate < input.txt   # run a tool (worker if up)
+    python launcher.py --timing spam < email.txt
+    python launcher.py --no-worker presale    # always run in this process
+    python launcher.py startup-bench validate # compare cold vs warm start
+
+    When stdin is not a terminal and no worker is running, the first call
+    runs locally and starts a worker in the background for later calls.
+    Only one worker runs per user and Python version; extra ones exit.
+
+    The worker notes the modification time of every project file it has
+    imported. After a tool is edited or deployed, the next call is refused
+    with a restart request and the worker exits; that call runs locally
+    and starts a worker with the new code. No manual "stop" is needed.
+
+    The socket lives in a directory only you can open
+    ($XDG_RUNTIME_DIR/cop2373-launcher, else $TMPDIR/cop2373-launcher-<uid>),
+    and the client will not connect to a socket owned by anyone else.
+"""
+
+# Postponed annotations let the hints below use builtin generics without
+# importing typing, which would add several ms to every call.
+from __future__ import annotations
+
+import time
+
+# Taken before any other import so --timing includes the launcher's own cost.
+STARTED = time.perf_counter()
+
+# marshal is built into the interpreter; json would pull in re (~7 ms).
+# The client uses the C-level _socket module; socket would add enum and
+# selectors (~9 ms). Only serve() needs the full socket module.
+import _socket
+import marshal
+import os
+import stat
+import sys
+
+
+# Tool name -> "module:function". Modules are imported only when used.
+TOOLS: dict[str, str] = {
+    "presale": "AngelicaMunozProgrammingExercise1:main",
+    "spam": "AngelicaMunoz_ProgrammingExercise_2:run_spam_scanner",
+    "expenses": "AngelicaMunozProgrammingExercise3:run_expense_analyzer",
+    "validate": "AngelicaMunoz_ProgrammingExercise_6:run_validation_program",
+    "intake": "record_pipeline:run_intake",
+    "telemetry": "sale_telemetry:run_scraper",
+    "load-test": "ticket_sale_benchmark:run_benchmark",
+}
+
+# Long-running or multi-process tools that should not run inside the worker.
+LOCAL_ONLY = {"telemetry", "load-test"}
+
+# The socket carries everything callers pipe in (SSNs, phone numbers), so it
+# lives in a directory only this user can open. marshal's format can change
+# between Python versions, so each version gets its own worker.
+RUNTIME_DIR = (
+    os.path.join(os.environ["XDG_RUNTIME_DIR"], "cop2373-launcher")
+    if os.environ.get("XDG_RUNTIME_DIR")
+    else os.path.join(
+        os.environ.get("TMPDIR", "/tmp"),
+        f"cop2373-launcher-{os.getuid() if hasattr(os, 'getuid') else 0}",
+    )
+)
+WORKER_NAME = f"worker-py{sys.version_info[0]}{sys.version_info[1]}"
+SOCKET_PATH = os.path.join(RUNTIME_DIR, WORKER_NAME + ".sock")
+LOCK_PATH = os.path.join(RUNTIME_DIR, WORKER_NAME + ".lock")
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# How long startup-bench waits for a worker it started to accept calls.
+WORKER_START_TIMEOUT = 5.0
+
+
+def load_tool(name: str):
+    """
+    Brief description:
+        Import a tool's module on demand and return its entry function.
+
+    Parameters (name: type):
+        name (str): A key of TOOLS.
+
+    Variables (name: type):
+        module_name (str): The module that holds the tool.
+        function_name (str): The tool's entry function.
+
+    Logical steps:
+        1. Split the TOOLS entry into module and function names.
+        2. Import the module (a no-op if it is already imported).
+        3. Return the function.
+
+    Return:
+        Callable[[], None]: The tool's entry function.
+    """
+    import importlib
+
+    module_name, function_name = TOOLS[name].split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def run_tool(name: str, args: list[str]) -> tuple[int, float, float]:
+    """
+    Brief description:
+        Import and run one tool in this process.
+
+    Parameters (name: type):
+        name (str): A key of TOOLS.
+        args (list[str]): Command-line arguments for the tool.
+
+    Variables (name: type):
+        import_seconds (float): Time spent importing the tool.
+        run_seconds (float): Time spent running the tool.
+        code (int): The tool's exit status.
+
+    Logical steps:
+        1. Import the tool and time the import.
+        2. Set sys.argv so argparse-based tools see their own arguments.
+        3. Run the tool, turning SystemExit and errors into an exit status.
+
+    Return:
+        tuple[int, float, float]: (exit status, import seconds, run seconds)
+    """
+    start = time.perf_counter()
+    tool = load_tool(name)
+    import_seconds = time.perf_counter() - start
+
+    sys.argv = [name] + args
+    code = 0
+    start = time.perf_counter()
+    try:
+        tool()
+    except SystemExit as exit_request:
+        if isinstance(exit_request.code, int):
+            code = exit_request.code
+        elif exit_request.code is not None:
+            print(exit_request.code, file=sys.stderr)
+            code = 1
+    except (EOFError, KeyboardInterrupt):
+        # Interactive tools hit EOF when their scripted input runs out.
+        code = 1
+    except Exception:
+        import traceback
+
+        traceback.print_exc()
+        code = 1
+    finally:
+        sys.stdout.flush()
+
+    return code, import_seconds, time.perf_counter() - start
+
+
+def _send_message(conn: _socket.socket, message: dict) -> None:
+    """Send one length-prefixed, marshalled message."""
+    data = marshal.dumps(message)
+    conn.sendall(len(data).to_bytes(8, "big") + data)
+
+
+def _receive_message(conn: _socket.socket) -> dict | None:
+    """Receive one length-prefixed, marshalled message, or None if the peer closed."""
+    header = _receive_exactly(conn, 8)
+    if header is None:
+        return None
+    body = _receive_exactly(conn, int.from_bytes(header, "big"))
+    return None if body is None else marshal.loads(body)
+
+
+def _receive_exactly(conn: _socket.socket, size: int) -> bytes | None:
+    """Read exactly size bytes, or None if the connection closes first."""
+    chunks = []
+    while size:
+        chunk = conn.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def handle_request(request: dict) -> dict:
+    """
+    Brief description:
+        Run one tool call inside the worker with captured input and output.
+
+    Parameters (name: type):
+        request (dict): {"tool", "args", "stdin", "cwd"} sent by the client.
+
+    Variables (name: type):
+        stdout (io.StringIO): Captured standard output.
+        stderr (io.StringIO): Captured standard error.
+
+    Logical steps:
+        1. Change to the caller's working directory.
+        2. Replace stdin, stdout, and stderr with in-memory buffers.
+        3. Run the tool and return its output, status, and timings.
+
+    Return:
+        dict: {"stdout", "stderr", "code", "import_s", "run_s"}
+    """
+    import io
+
+    os.chdir(request["cwd"])
+    stdout, stderr = io.StringIO(), io.StringIO()
+    sys.stdin = io.StringIO(request["stdin"])
+    sys.stdout, sys.stderr = stdout, stderr
+
+    code, import_seconds, run_seconds = run_tool(request["tool"], request["args"])
+
+    sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "code": code,
+        "import_s": import_seconds,
+        "run_s": run_seconds,
+    }
+
+
+def _is_private(path: str, kind: int) -> bool:
+    """
+    Return True if path is a kind (stat.S_IFDIR or stat.S_IFSOCK) entry
+    owned by this user, not a symlink, and, for directories, closed to
+    everyone else.
+    """
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    if stat.S_IFMT(info.st_mode) != kind:
+        return False
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        return False
+    return kind != stat.S_IFDIR or info.st_mode & 0o077 == 0
+
+
+def _source_mtimes() -> dict[str, int]:
+    """Modification times of every loaded module that lives in this project."""
+    mtimes = {}
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == HERE:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = -1
+    return mtimes
+
+
+def _sources_changed(mtimes: dict[str, int]) -> bool:
+    """Return True if any file recorded by _source_mtimes was edited or removed."""
+    for path, mtime in mtimes.items():
+        try:
+            if os.stat(path).st_mtime_ns != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def _acquire_worker_lock() -> int | None:
+    """
+    Brief description:
+        Take the exclusive lock that allows only one worker per user and
+        Python version.
+
+    Variables (name: type):
+        lock_fd (int): Open descriptor of LOCK_PATH; the lock lasts as long
+            as it stays open.
+        deadline (float): When to stop waiting for the lock.
+
+    Logical steps:
+        1. Open (or create) the lock file, readable only by this user.
+        2. Try the lock without blocking for up to two seconds, so a worker
+           started just as an old one exits can still take over.
+        3. Return the descriptor, or None if another worker holds the lock.
+
+    Return:
+        int | None: The locked descriptor, or None.
+    """
+    import fcntl
+
+    lock_fd = os.open(LOCK_PATH, os.O_RDWR | os.O_CREAT, 0o600)
+    deadline = time.monotonic() + 2.0
+    while True:
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return lock_fd
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                os.close(lock_fd)
+                return None
+            time.sleep(0.05)
+
+
+def _handle_connection(conn: _socket.socket, stale: bool) -> bool:
+    """
+    Brief description:
+        Answer one client connection.
+
+    Parameters (name: type):
+        conn (socket): The accepted connection.
+        stale (bool): True if the tools' source files changed since start-up.
+
+    Logical steps:
+        1. Receive the request.
+        2. Answer a stop request, or a restart request if the code is stale.
+        3. Otherwise run the tool and send back its output.
+
+    Return:
+        bool: False if the worker should shut down after this call.
+    """
+    request = _receive_message(conn)
+    if request is None:
+        return True
+    if request.get("stop"):
+        _send_message(conn, {"stopped": True})
+        return False
+    if stale:
+        _send_message(conn, {"restart": True})
+        return False
+    _send_message(conn, handle_request(request))
+    return True
+
+
+def serve() -> None:
+    """
+    Brief description:
+        Run the pre-warmed worker until asked to stop or its code changes.
+
+    Variables (name: type):
+        lock_fd (int | None): The single-worker lock, while held.
+        mtimes (dict[str, int]): Source file times recorded at start-up.
+        server (socket.socket): The listening Unix socket.
+        conn (socket.socket): One client connection.
+        stale (bool): True once a source file has changed.
+
+    Logical steps:
+        1. Create the private runtime directory and take the worker lock;
+           exit quietly if another worker already holds it.
+        2. If a socket file exists and a worker answers on it, exit;
+           otherwise it is stale and is removed.
+        3. Import every worker-safe tool up front (the pre-warm) and record
+           the modification times of the project files it loaded.
+        4. Listen on SOCKET_PATH. For each call, fork right after accept()
+           and let the child read the request and run the tool, so a slow
+           caller never holds up the others. Without fork, run calls one at
+           a time in-process.
+        5. When a source file changes, answer the next call with a restart
+           request and exit, so edited or newly deployed code is picked up.
+        6. Remove the socket file and release the lock on exit.
+
+    Return:
+        None
+    """
+    import socket
+
+    os.makedirs(RUNTIME_DIR, mode=0o700, exist_ok=True)
+    if not _is_private(RUNTIME_DIR, stat.S_IFDIR):
+        print(f"Refusing to serve: {RUNTIME_DIR} is not a private directory owned by you.",
+              file=sys.stderr)
+        sys.exit(1)
+
+    lock_fd = _acquire_worker_lock()
+    if lock_fd is None:
+        return
+
+    server = None
+    try:
+        if os.path.exists(SOCKET_PATH):
+            existing = connect_worker()
+            if existing is not None:
+                existing.close()
+                return
+            os.unlink(SOCKET_PATH)
+
+        for name in TOOLS:
+            if name not in LOCAL_ONLY:
+                load_tool(name)
+        mtimes = _source_mtimes()
+
+        can_fork = hasattr(os, "fork")
+        if can_fork:
+            import signal
+
+            # Let the kernel reap finished children; no zombies, no waitpid loop.
+            signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+            # A child that receives "stop" signals the parent to shut down.
+            signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(SOCKET_PATH)
+        server.listen(64)
+        print(f"Launcher worker ready on {SOCKET_PATH} (pid {os.getpid()})", flush=True)
+
+        keep_running = True
+        while keep_running:
+            conn, _ = server.accept()
+            stale = _sources_changed(mtimes)
+            with conn:
+                if not can_fork:
+                    keep_running = _handle_connection(conn, stale)
+                elif os.fork() == 0:
+                    server.close()
+                    os.close(lock_fd)
+                    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                    try:
+                        if not _handle_connection(conn, stale) and not stale:
+                            os.kill(os.getppid(), signal.SIGTERM)
+                    finally:
+                        os._exit(0)
+                elif stale:
+                    keep_running = False
+    finally:
+        if server is not None:
+            server.close()
+            if os.path.exists(SOCKET_PATH):
+                os.unlink(SOCKET_PATH)
+        os.close(lock_fd)
+
+
+def connect_worker() -> _socket.socket | None:
+    """
+    Connect to a running worker, or return None if none is listening or
+    the socket is not safely owned by this user.
+    """
+    if not hasattr(_socket, "AF_UNIX"):
+        return None
+    if not _is_private(RUNTIME_DIR, stat.S_IFDIR) or not _is_private(SOCKET_PATH, stat.S_IFSOCK):
+        return None
+    conn = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        conn.connect(SOCKET_PATH)
+    except OSError:
+        conn.close()
+        return None
+    return conn
+
+
+def start_worker_in_background() -> None:
+    """Start a detached worker process that outlives this call."""
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve"],
+        cwd=HERE,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def stop_worker() -> None:
+    """Ask a running worker to shut down."""
+    conn = connect_worker()
+    if conn is None:
+        print("No launcher worker is running.")
+        return
+    try:
+        _send_message(conn, {"stop": True})
+        _receive_message(conn)
+    finally:
+        conn.close()
+    print("Launcher worker stopped.")
+
+
+def dispatch(name: str, args: list[str], use_worker: bool, timing: bool) -> int:
+    """
+    Brief description:
+        Run a tool through the warm worker when possible, else locally.
+
+    Parameters (name: type):
+        name (str): A key of TOOLS.
+        args (list[str]): Command-line arguments for the tool.
+        use_worker (bool): False to always run in this process.
+        timing (bool): True to report start-up timings on stderr.
+
+    Variables (name: type):
+        stdin_text (str): All of standard input, read before connecting.
+        conn (_socket.socket | None): Connection to the worker, if any.
+        reply (dict | None): The worker's answer, if it ran the tool.
+        dispatched (float): When the launcher handed the call off, either
+            to the worker (before connecting) or to the local run.
+        round_trip (float | None): Seconds from connecting to the worker
+            to receiving its reply, if a connection was made.
+        where (str): "worker" or "local", for the timing report.
+
+    Logical steps:
+        1. Use the worker only for non-interactive, worker-safe tools.
+        2. Read all of stdin, then, if a worker answers, send the call and
+           print the reply.
+        3. If there is no worker, or it asks for a restart because its code
+           changed, run locally and start a worker for later calls.
+        4. Report timings if asked (launcher overhead, worker round-trip,
+           tool import and run, total) and return the exit status.
+
+    Return:
+        int: The tool's exit status.
+    """
+    reply = None
+    round_trip = None
+    interactive = sys.stdin is None or sys.stdin.isatty()
+    eligible = use_worker and not interactive and name not in LOCAL_ONLY
+
+    if eligible:
+        # Read all input before connecting, so a slow producer only delays
+        # this call and never holds a worker connection open.
+        stdin_text = sys.stdin.read()
+        dispatched = time.perf_counter()
+        conn = connect_worker()
+        if conn is not None:
+            try:
+                _send_message(conn, {"tool": name, "args": args, "stdin": stdin_text, "cwd": os.getcwd()})
+                reply = _receive_message(conn)
+            except OSError:
+                reply = None
+            finally:
+                conn.close()
+            round_trip = time.perf_counter() - dispatched
+        if reply is None or reply.get("restart"):
+            # No worker, or one that is shutting down for new code. The
+            # worker-safe tools only produce output, so running here is safe.
+            import io
+
+            reply = None
+            sys.stdin = io.StringIO(stdin_text)
+    else:
+        dispatched = time.perf_counter()
+
+    if reply is not None:
+        sys.stdout.write(reply["stdout"])
+        sys.stderr.write(reply["stderr"])
+        code, import_seconds, run_seconds = reply["code"], reply["import_s"], reply["run_s"]
+        where = "worker"
+    else:
+        code, import_seconds, run_seconds = run_tool(name, args)
+        where = "local"
+        if eligible and hasattr(_socket, "AF_UNIX"):
+            start_worker_in_background()
+
+    if timing:
+        total = time.perf_counter() - STARTED
+        tool = f"tool import {import_seconds * 1000:.1f} ms, run {run_seconds * 1000:.1f} ms"
+        parts = [f"launcher {(dispatched - STARTED) * 1000:.1f} ms"]
+        if round_trip is not None:
+            # On the worker path, import and run happen inside the round-trip.
+            parts.append(f"worker round-trip {round_trip * 1000:.1f} ms"
+                         + (f" ({tool})" if reply is not None else ""))
+        if reply is None:
+            parts.append(tool)
+        parts.append(f"total {total * 1000:.1f} ms (excludes interpreter start)")
+        print(f"[startup] {where}: " + ", ".join(parts), file=sys.stderr)
+    return code
+
+
+def startup_bench(name: str, runs: int, stdin_text: str) -> None:
+    """
+    Brief description:
+        Compare full process start-up of a tool run directly vs. via the worker.
+
+    Parameters (name: type):
+        name (str): A key of TOOLS (not LOCAL_ONLY).
+        runs (int): Calls to time for each way of running.
+        stdin_text (str): Input fed to every call.
+
+    Variables (name: type):
+        script (str): The tool's module file, for the direct run.
+        started_worker (bool): True if this benchmark started the worker.
+        deadline (float): When to stop waiting for a started worker.
+        timings (dict[str, float]): Mean wall-clock seconds per method.
+
+    Logical steps:
+        1. Time "python <tool script>" (the old cron way).
+        2. Time "python launcher.py --no-worker <tool>" (lazy import only).
+        3. Make sure a worker is up, waiting at most WORKER_START_TIMEOUT,
+           then time "python launcher.py <tool>". If the worker never
+           comes up, say so and skip this timing.
+        4. Print the mean time for each and stop any worker it started.
+
+    Return:
+        None
+    """
+    import subprocess
+
+    script = os.path.join(HERE, TOOLS[name].split(":")[0] + ".py")
+    launcher = os.path.abspath(__file__)
+    started_worker = False
+
+    def mean_wall_time(command: list[str]) -> float:
+        start = time.perf_counter()
+        for _ in range(runs):
+            subprocess.run(command, input=stdin_text, text=True, capture_output=True, cwd=HERE)
+        return (time.perf_counter() - start) / runs
+
+    timings = {
+        "python -c pass (interpreter only)": mean_wall_time([sys.executable, "-c", "pass"]),
+        f"python {os.path.basename(script)}": mean_wall_time([sys.executable, script]),
+        f"launcher.py --no-worker {name}": mean_wall_time([sys.executable, launcher, "--no-worker", name]),
+    }
+
+    worker = connect_worker()
+    if worker is None:
+        start_worker_in_background()
+        started_worker = True
+        deadline = time.perf_counter() + WORKER_START_TIMEOUT
+        while worker is None and time.perf_counter() < deadline:
+            time.sleep(0.05)
+            worker = connect_worker()
+    if worker is not None:
+        # Only probing; the worker's child sees EOF and exits.
+        worker.close()
+        timings[f"launcher.py {name} (warm worker)"] = mean_wall_time([sys.executable, launcher, name])
+
+    if started_worker and worker is not None:
+        stop_worker()
+
+    print(f"Mean start-to-exit time over {runs} runs:")
+    for label, seconds in timings.items():
+        print(f"  {label:<45} {seconds * 1000:8.1f} ms")
+    if worker is None:
+        print(f"  The launcher worker did not start within {WORKER_START_TIMEOUT:g} s; "
+              f"run 'python launcher.py serve' to see why.")
+
+
+def main() -> None:
+    """
+    Brief description:
+        Parse launcher options and run the requested subcommand.
+
+    Variables (name: type):
+        argv (list[str]): Arguments after the script name.
+        timing (bool): True if --timing was given.
+        use_worker (bool): False if --no-worker was given.
+
+    Logical steps:
+        1. Strip launcher options that come before the subcommand.
+        2. Handle serve, stop, and startup-bench.
+        3. Otherwise dispatch the tool and exit with its status.
+
+    Return:
+        None
+    """
+    argv = sys.argv[1:]
+    timing = False
+    use_worker = True
+    while argv and argv[0].startswith("--"):
+        option = argv.pop(0)
+        if option == "--timing":
+            timing = True
+        elif option == "--no-worker":
+            use_worker = False
+        else:
+            argv = []
+
+    if not argv or argv[0] not in set(TOOLS) | {"serve", "stop", "startup-bench"}:
+        print(__doc__.split("Usage:")[1].split("\n\n")[0].rstrip(), file=sys.stderr)
+        print(f"\nTools: {', '.join(TOOLS)}", file=sys.stderr)
+        sys.exit(2)
+
+    command, args = argv[0], argv[1:]
+    if command == "serve":
+        serve()
+    elif command == "stop":
+        stop_worker()
+    elif command == "startup-bench":
+        name = args[0] if args else "validate"
+        runs = int(args[1]) if len(args) > 1 else 20
+        sample = "(123) 456-7890\n123-45-6789\n12345\n" if name == "validate" else ""
+        startup_bench(name, runs, sample)
+    else:
+        sys.exit(dispatch(command, args, use_worker, timing))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Record Intake Pipeline
+
+Program Description:
+    This module runs large intake jobs that both spam-score free-text
+    fields and validate structured fields (phone, SSN, zip code). Each
+    record is wrapped in a RecordView that strips every field once and
+    normalizes each free-text field once, on first use. The spam scanner
+    and the validators then read from that view instead of re-normalizing
+    and copying the raw strings.
+
+    The pipeline is a chain of generator stages, so only one record is in
+    flight per stage and stages can be combined freely:
+
+        views = as_views(records)
+        views = spam_stage(views, ["message"])
+        views = validation_stage(views, DEFAULT_VALIDATORS)
+        for batch in batched(views, 500):
+            ...
+
+    Run this file on a CSV file to print one JSON line per record:
+        python record_pipeline.py intake.csv --text-fields message notes
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from AngelicaMunoz_ProgrammingExercise_2 import (
+    get_spam_triggers,
+    normalize,
+    rate_spam_likelihood,
+    scan_normalized_message,
+)
+from AngelicaMunoz_ProgrammingExercise_6 import (
+    validate_phone_number,
+    validate_social_security_number,
+    validate_zip_code,
+)
+
+
+# Field name -> validator, used when no validators are passed in.
+DEFAULT_VALIDATORS: Dict[str, Callable[[str], bool]] = {
+    "phone": validate_phone_number,
+    "ssn": validate_social_security_number,
+    "zip": validate_zip_code,
+}
+
+
+class RecordView:
+    """
+    Brief description:
+        One record's fields, stripped once, with cached normalized text.
+
+    Attributes (name: type):
+        number (int): 1-based position of the record in its input stream.
+        key (str | None): Value of the chosen key field, if one was given.
+        fields (dict[str, str]): Field values with surrounding whitespace removed.
+        results (dict[str, dict]): Output of each stage, keyed by stage name.
+    """
+
+    __slots__ = ("number", "key", "fields", "results", "_normalized")
+
+    def __init__(
+        self,
+        record: Mapping[str, object],
+        number: int = 0,
+        key_field: Optional[str] = None,
+    ) -> None:
+        """
+        Brief description:
+            Wrap a raw record, stripping each field once.
+
+        Parameters (name: type):
+            record (Mapping[str, object]): The raw record, e.g. a CSV row.
+            number (int): 1-based position of the record in its input stream.
+            key_field (str | None): Field whose value identifies the record.
+
+        Return:
+            None
+        """
+        self.fields: Dict[str, str] = {
+            name: ("" if value is None else str(value)).strip()
+            for name, value in record.items()
+        }
+        self.number = number
+        self.key = self.fields.get(key_field) if key_field is not None else None
+        self.results: Dict[str, Dict[str, object]] = {}
+        self._normalized: Dict[str, str] = {}
+
+    def normalized(self, name: str) -> str:
+        """
+        Brief description:
+            Return a field's normalized text, computing it only the first time.
+
+        Parameters (name: type):
+            name (str): The field name.
+
+        Variables (name: type):
+            text (str | None): The cached normalized text, if any.
+
+        Logical steps:
+            1. Return the cached text if this field was normalized before.
+            2. Otherwise normalize the stripped field, cache it, and return it.
+
+        Return:
+            str: The normalized field text ("" if the field is missing).
+        """
+        text = self._normalized.get(name)
+        if text is None:
+            text = normalize(self.fields.get(name, ""))
+            self._normalized[name] = text
+        return text
+
+
+def as_views(
+    records: Iterable[Mapping[str, object]],
+    key_field: Optional[str] = None,
+) -> Iterator[RecordView]:
+    """Wrap each raw record in a numbered RecordView as it is read."""
+    for number, record in enumerate(records, start=1):
+        yield RecordView(record, number, key_field)
+
+
+def spam_stage(
+    views: Iterable[RecordView],
+    text_fields: List[str],
+    triggers: Optional[List[str]] = None,
+) -> Iterator[RecordView]:
+    """
+    Brief description:
+        Spam-score free-text fields using each view's normalized text.
+
+    Parameters (name: type):
+        views (Iterable[RecordView]): Records from the previous stage.
+        text_fields (list[str]): Fields to scan.
+        triggers (list[str] | None): Trigger list; defaults to get_spam_triggers().
+
+    Variables (name: type):
+        scores (dict[str, dict]): Score, rating, and found triggers per field.
+
+    Logical steps:
+        1. Load the triggers once for the whole stream.
+        2. For each view, scan each text field's normalized text, skipping
+           fields the record does not have (as validation_stage does).
+        3. Store the results under results["spam"] and pass the view on.
+
+    Return:
+        Iterator[RecordView]: The same views, with spam results added.
+    """
+    if triggers is None:
+        triggers = get_spam_triggers()
+
+    for view in views:
+        scores: Dict[str, object] = {}
+        for name in text_fields:
+            if name not in view.fields:
+                continue
+            score, found = scan_normalized_message(view.normalized(name), triggers)
+            scores[name] = {"score": score, "rating": rate_spam_likelihood(score), "found": found}
+        view.results["spam"] = scores
+        yield view
+
+
+def validation_stage(
+    views: Iterable[RecordView],
+    validators: Optional[Mapping[str, Callable[[str], bool]]] = None,
+) -> Iterator[RecordView]:
+    """
+    Brief description:
+        Validate structured fields using each view's stripped values.
+
+    Parameters (name: type):
+        views (Iterable[RecordView]): Records from the previous stage.
+        validators (Mapping[str, Callable] | None): Field name to validator;
+            defaults to DEFAULT_VALIDATORS.
+
+    Variables (name: type):
+        checks (dict[str, bool]): Validation result per field.
+
+    Logical steps:
+        1. For each view, run each validator on its field, if present.
+        2. Store the results under results["valid"] and pass the view on.
+
+    Return:
+        Iterator[RecordView]: The same views, with validation results added.
+    """
+    if validators is None:
+        validators = DEFAULT_VALIDATORS
+
+    for view in views:
+        checks: Dict[str, object] = {}
+        for name, validator in validators.items():
+            if name in view.fields:
+                checks[name] = validator(view.fields[name])
+        view.results["valid"] = checks
+        yield view
+
+
+def batched(views: Iterable[RecordView], size: int) -> Iterator[List[RecordView]]:
+    """
+    Brief description:
+        Group views into lists of at most size for batched output.
+
+    Parameters (name: type):
+        views (Iterable[RecordView]): Records from the previous stage.
+        size (int): Maximum records per batch.
+
+    Variables (name: type):
+        batch (list[RecordView]): The batch being filled.
+
+    Logical steps:
+        1. Reject sizes below 1.
+        2. Collect views until the batch is full, then yield it.
+        3. Yield any partial batch left at the end.
+
+    Return:
+        Iterator[list[RecordView]]: Batches of views.
+    """
+    if size < 1:
+        raise ValueError(f"Batch size must be at least 1, not {size}.")
+
+    batch: List[RecordView] = []
+    for view in views:
+        batch.append(view)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_pipeline(
+    records: Iterable[Mapping[str, object]],
+    text_fields: List[str],
+    validators: Optional[Mapping[str, Callable[[str], bool]]] = None,
+    batch_size: int = 500,
+    key_field: Optional[str] = None,
+) -> Iterator[List[RecordView]]:
+    """
+    Brief description:
+        Chain the standard stages: view, spam score, validate, batch.
+
+    Parameters (name: type):
+        records (Iterable[Mapping[str, object]]): Raw input records.
+        text_fields (list[str]): Fields to spam-score.
+        validators (Mapping[str, Callable] | None): Field name to validator.
+        batch_size (int): Maximum records per batch.
+        key_field (str | None): Field whose value identifies each record.
+
+    Return:
+        Iterator[list[RecordView]]: Batches of processed views.
+    """
+    views = as_views(records, key_field)
+    views = spam_stage(views, text_fields)
+    views = validation_stage(views, validators)
+    return batched(views, batch_size)
+
+
+def positive_int(text: str) -> int:
+    """Parse a command-line value that must be an integer of at least 1."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def result_line(view: RecordView) -> str:
+    """
+    Brief description:
+        Format one record's results as a JSON line that identifies the record.
+
+    Parameters (name: type):
+        view (RecordView): A processed record.
+
+    Variables (name: type):
+        output (dict[str, object]): The record number, key, and stage results.
+
+    Logical steps:
+        1. Start with the record number and, if set, its key.
+        2. Add each stage's results.
+        3. Return the JSON text with a trailing newline.
+
+    Return:
+        str: One JSON line.
+    """
+    output: Dict[str, object] = {"record": view.number}
+    if view.key is not None:
+        output["key"] = view.key
+    output.update(view.results)
+    return json.dumps(output) + "\n"
+
+
+def run_intake() -> None:
+    """
+    Brief description:
+        Process a CSV file and print each record's results as a JSON line.
+
+    Variables (name: type):
+        args (argparse.Namespace): Parsed command-line options.
+        reader (csv.DictReader): The CSV rows, keyed by header name.
+        wanted (list[str]): Text fields plus the key field, if given.
+        missing (list[str]): Requested fields that are not CSV columns.
+        batch (list[RecordView]): One batch of processed records.
+
+    Logical steps:
+        1. Parse the CSV path, text fields, key field, and batch size.
+        2. Exit with an error if a text field or the key field is not a
+           column in the CSV header, so a typo is not scored as empty text.
+        3. Stream the CSV rows through run_pipeline.
+        4. Write each batch's results to standard output in one call. Each
+           line carries "record" (1-based data row, not counting the header)
+           and, with --key-field, "key", so results can be joined back to
+           their input rows.
+
+    Return:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Spam-score and validate intake records.")
+    parser.add_argument("path", help="CSV file with a header row")
+    parser.add_argument("--text-fields", nargs="+", default=["message"])
+    parser.add_argument("--key-field", help="field copied to each output line as \"key\"")
+    parser.add_argument("--batch-size", type=positive_int, default=500)
+    args = parser.parse_args()
+
+    with open(args.path, newline="", encoding="utf-8") as source:
+        reader = csv.DictReader(source)
+        wanted = args.text_fields + ([args.key_field] if args.key_field else [])
+        missing = [name for name in wanted if name not in (reader.fieldnames or [])]
+        if missing:
+            parser.error(f"{args.path} has no column(s) {', '.join(missing)}; "
+                         f"its header is: {', '.join(reader.fieldnames or [])}")
+
+        batches = run_pipeline(
+            reader, args.text_fields,
+            batch_size=args.batch_size, key_field=args.key_field,
+        )
+        for batch in batches:
+            sys.stdout.write("".join(result_line(view) for view in batch))
+
+
+if __name__ == "__main__":
+    run_intake()
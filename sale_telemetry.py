@@ -0,0 +1,388 @@
+"""
+Sale Telemetry
+
+Program Description:
+    This module keeps live pre-sale numbers in a named shared-memory block
+    so operations can watch an on-sale without touching the sale process.
+    The sale loop is the only writer: it bumps plain 64-bit counters and a
+    latency histogram, which costs a few memory writes and no locks or
+    system calls. Any other process can attach to the block by name and
+    read it (scrape it) as often as it likes.
+
+    Run this file to scrape a running sale:
+        python sale_telemetry.py cinema-presale --interval 1
+
+Shared-memory layout (signed 64-bit slots):
+    0: layout version          5: rejected, outside 1-MAX_PER_BUYER
+    1: tickets remaining       6: rejected, exceeds remaining
+    2: purchases               7: validations timed
+    3: tickets sold            8: total validation time (ns)
+    4: rejected, non-integer   9: sale start time (ns since epoch)
+                              10: pid of the sale process (the owner)
+    11 onward: validation latency histogram; bucket i counts latencies
+               below 2**i nanoseconds (the last bucket holds the rest).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List
+
+
+LAYOUT_VERSION = 2
+SLOT_SIZE = 8
+
+VERSION = 0
+TICKETS_REMAINING = 1
+PURCHASES = 2
+TICKETS_SOLD = 3
+REJECTED_SLOTS: Dict[str, int] = {
+    "non_integer": 4,
+    "out_of_range": 5,
+    "exceeds_remaining": 6,
+}
+VALIDATIONS = 7
+VALIDATION_NS = 8
+STARTED_NS = 9
+OWNER_PID = 10
+HISTOGRAM = 11
+HISTOGRAM_BUCKETS = 32
+
+SLOT_COUNT = HISTOGRAM + HISTOGRAM_BUCKETS
+
+
+class SaleTelemetry:
+    """
+    Brief description:
+        Writer or reader for one sale's shared-memory metrics block.
+
+    Attributes (name: type):
+        name (str): Name of the shared-memory block.
+        owner (bool): True if this object created the block (the writer).
+    """
+
+    def __init__(self, name: str, create: bool = False) -> None:
+        """
+        Brief description:
+            Create a new metrics block, or attach to an existing one.
+
+        Parameters (name: type):
+            name (str): Name of the shared-memory block.
+            create (bool): True for the sale process, False for scrapers.
+
+        Logical steps:
+            1. Create or attach to the shared-memory block. When creating,
+               a block left behind by a crashed sale is removed first; a
+               block whose sale is still running raises FileExistsError.
+            2. View its bytes as an array of 64-bit integers.
+            3. When creating, claim the block with this process's pid, zero
+               the other slots, and stamp the version and start.
+            4. When attaching, check the layout version.
+
+        Return:
+            None
+        """
+        self.name = name
+        self.owner = create
+
+        if create:
+            self._shm = _create_replacing_stale(name, SLOT_COUNT * SLOT_SIZE)
+        else:
+            self._shm = _attach_untracked(name)
+
+        self._slots = self._shm.buf.cast("q")
+
+        if create:
+            # The pid goes first so a sale starting at the same moment
+            # sees the block as taken, not as left behind.
+            self._slots[OWNER_PID] = os.getpid()
+            for index in range(SLOT_COUNT):
+                if index != OWNER_PID:
+                    self._slots[index] = 0
+            self._slots[STARTED_NS] = time.time_ns()
+            self._slots[VERSION] = LAYOUT_VERSION
+        elif self._slots[VERSION] != LAYOUT_VERSION:
+            version = self._slots[VERSION]
+            self.close()
+            raise ValueError(f"Unsupported telemetry layout version {version} in '{name}'.")
+
+    def set_tickets_remaining(self, tickets_remaining: int) -> None:
+        """Publish the current number of tickets remaining."""
+        self._slots[TICKETS_REMAINING] = tickets_remaining
+
+    def record_purchase(self, requested: int, tickets_remaining: int) -> None:
+        """Count one completed purchase and publish the tickets remaining."""
+        slots = self._slots
+        slots[PURCHASES] += 1
+        slots[TICKETS_SOLD] += requested
+        slots[TICKETS_REMAINING] = tickets_remaining
+
+    def record_validation(self, reason: str, elapsed_ns: int) -> None:
+        """
+        Brief description:
+            Count one validation, its outcome, and how long it took.
+
+        Parameters (name: type):
+            reason (str): "" if the request was valid, else a REJECTED_SLOTS key.
+            elapsed_ns (int): Time spent validating, in nanoseconds.
+
+        Variables (name: type):
+            bucket (int): Histogram bucket for elapsed_ns.
+
+        Logical steps:
+            1. Increment the counter for the rejection reason, if any.
+            2. Add the latency to the totals and to its histogram bucket.
+
+        Return:
+            None
+        """
+        slots = self._slots
+        if reason:
+            slots[REJECTED_SLOTS[reason]] += 1
+
+        slots[VALIDATIONS] += 1
+        slots[VALIDATION_NS] += elapsed_ns
+
+        # bit_length gives the power-of-two bucket without a loop.
+        bucket = min(elapsed_ns.bit_length(), HISTOGRAM_BUCKETS - 1)
+        slots[HISTOGRAM + bucket] += 1
+
+    def read(self) -> Dict[str, object]:
+        """
+        Brief description:
+            Copy the current metrics out of shared memory.
+
+        Variables (name: type):
+            values (list[int]): A copy of every slot.
+
+        Logical steps:
+            1. Copy all slots in one pass so the scrape is short.
+            2. Return them as a labelled dictionary.
+
+        Return:
+            dict[str, object]: Counter values plus the latency histogram.
+        """
+        values = self._slots.tolist()
+        return {
+            "tickets_remaining": values[TICKETS_REMAINING],
+            "purchases": values[PURCHASES],
+            "tickets_sold": values[TICKETS_SOLD],
+            "rejected": {reason: values[slot] for reason, slot in REJECTED_SLOTS.items()},
+            "validations": values[VALIDATIONS],
+            "validation_ns": values[VALIDATION_NS],
+            "started_ns": values[STARTED_NS],
+            "histogram": values[HISTOGRAM:HISTOGRAM + HISTOGRAM_BUCKETS],
+        }
+
+    def close(self) -> None:
+        """Detach from the block; the owner also removes it, if still there."""
+        self._slots.release()
+        self._shm.close()
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                # Removed by hand (or by another tool) while the sale ran.
+                # unlink skips its tracker bookkeeping when it fails, so do
+                # it here to keep the tracker from warning at exit.
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+
+    def __enter__(self) -> "SaleTelemetry":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _create_replacing_stale(name: str, size: int) -> shared_memory.SharedMemory:
+    """
+    Brief description:
+        Create a block, replacing one of the same name only if the sale that
+        owned it is gone (killed before it could clean up).
+
+    Parameters (name: type):
+        name (str): Name of the shared-memory block.
+        size (int): Size of the block in bytes.
+
+    Variables (name: type):
+        existing (SharedMemory): The block already using this name.
+        owner_pid (int): Pid stamped in the existing block (0 if unknown).
+
+    Logical steps:
+        1. Try to create the block.
+        2. If the name is taken, read the owner's pid from the existing block.
+        3. If that process is still alive (or the pid is unreadable), raise
+           FileExistsError: a sale is already running under this name.
+        4. Otherwise unlink the stale block and create a fresh one. Scrapers
+           still attached to the old block keep their mapping but see no
+           new data.
+
+    Return:
+        SharedMemory: The newly created block.
+    """
+    try:
+        return shared_memory.SharedMemory(name, create=True, size=size)
+    except FileExistsError:
+        existing = _attach_untracked(name)
+
+    slots = existing.buf.cast("q")
+    owner_pid = 0
+    if len(slots) > OWNER_PID and slots[VERSION] == LAYOUT_VERSION:
+        owner_pid = slots[OWNER_PID]
+    slots.release()
+
+    if owner_pid <= 0 or _process_alive(owner_pid):
+        existing.close()
+        raise FileExistsError(
+            f"A sale is already running with telemetry '{name}' (pid {owner_pid or 'unknown'}). "
+            "Use another name, or remove the block if that sale is gone."
+        )
+
+    existing.close()
+    stale = shared_memory.SharedMemory(name)
+    stale.close()
+    stale.unlink()
+    return shared_memory.SharedMemory(name, create=True, size=size)
+
+
+def _process_alive(pid: int) -> bool:
+    """Return True if a process with this pid exists (signal 0 only checks)."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, but belongs to another user.
+        return True
+    return True
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing block without letting this process's resource
+    tracker delete it on exit (Python < 3.13 tracks attached blocks too).
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def histogram_percentile(histogram: List[int], fraction: float) -> int:
+    """
+    Brief description:
+        Estimate a latency percentile from the power-of-two histogram.
+
+    Parameters (name: type):
+        histogram (list[int]): Bucket counts from read().
+        fraction (float): Percentile as a fraction, e.g. 0.99.
+
+    Variables (name: type):
+        target (float): Number of samples at or below the percentile.
+        seen (int): Running total of samples.
+
+    Logical steps:
+        1. Walk the buckets until the running total reaches the target.
+        2. Return that bucket's upper bound.
+
+    Return:
+        int: Upper bound of the percentile, in nanoseconds (0 if empty).
+    """
+    target = fraction * sum(histogram)
+    seen = 0
+    for bucket, count in enumerate(histogram):
+        seen += count
+        if count and seen >= target:
+            return 2 ** bucket
+    return 0
+
+
+def format_metrics(current: Dict[str, object], previous: Dict[str, object], seconds: float) -> str:
+    """
+    Brief description:
+        Turn two scrapes into one line of live numbers.
+
+    Parameters (name: type):
+        current (dict): The latest scrape.
+        previous (dict): The scrape before it.
+        seconds (float): Time between the two scrapes.
+
+    Variables (name: type):
+        rate (float): Purchases per second between the scrapes.
+        rejected (dict[str, int]): Rejection counts by reason.
+        mean_ns (float): Mean validation latency.
+
+    Logical steps:
+        1. Compute purchases/sec from the difference between scrapes.
+        2. Compute mean and percentile validation latency.
+        3. Join everything into one line.
+
+    Return:
+        str: A human-readable metrics line.
+    """
+    rate = (current["purchases"] - previous["purchases"]) / seconds if seconds else 0.0
+    rejected = current["rejected"]
+    mean_ns = current["validation_ns"] / current["validations"] if current["validations"] else 0.0
+    histogram = current["histogram"]
+
+    return (
+        f"remaining={current['tickets_remaining']} "
+        f"purchases={current['purchases']} ({rate:.1f}/s) "
+        f"rejected: non_integer={rejected['non_integer']} "
+        f"out_of_range={rejected['out_of_range']} "
+        f"exceeds_remaining={rejected['exceeds_remaining']} "
+        f"validation_us: mean={mean_ns / 1000:.1f} "
+        f"p50<={histogram_percentile(histogram, 0.50) / 1000:.1f} "
+        f"p99<={histogram_percentile(histogram, 0.99) / 1000:.1f}"
+    )
+
+
+def run_scraper() -> None:
+    """
+    Brief description:
+        Attach to a running sale's metrics and print them periodically.
+
+    Variables (name: type):
+        args (argparse.Namespace): Parsed command-line options.
+        previous (dict): The last scrape, used for rates.
+
+    Logical steps:
+        1. Parse the block name and interval.
+        2. Attach to the block as a reader.
+        3. Print one metrics line per interval until interrupted.
+
+    Return:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Scrape live pre-sale telemetry.")
+    parser.add_argument("name", help="shared-memory name passed to the sale")
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--once", action="store_true", help="print one scrape and exit")
+    args = parser.parse_args()
+
+    with SaleTelemetry(args.name) as telemetry:
+        previous = telemetry.read()
+        last = time.perf_counter()
+
+        if args.once:
+            print(format_metrics(previous, previous, 0.0))
+            return
+
+        try:
+            while True:
+                time.sleep(args.interval)
+                current = telemetry.read()
+                now = time.perf_counter()
+                print(format_metrics(current, previous, now - last))
+                previous, last = current, now
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    run_scraper()
@@ -0,0 +1,454 @@
+"""
+Ticket Purchase Journal
+
+Program Description:
+    This module keeps the cinema pre-sale counters (tickets remaining and
+    total buyers) safe across crashes. Every purchase is appended to a
+    journal file. Purchases from several callers are written together and
+    made durable with a single fsync (group commit). Every so often the
+    current counters are written to a small snapshot file and the journal
+    is emptied, so a restart only replays the purchases made after the
+    last snapshot.
+
+File layout (inside the journal directory):
+    snapshot.json: {"seq": int, "tickets_remaining": int, "total_buyers": int}
+    purchases.log: one line per purchase, "seq requested crc32"
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import zlib
+from typing import List, Optional, Tuple
+
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "purchases.log"
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_SNAPSHOT_EVERY = 256
+
+
+def encode_record(seq: int, requested: int) -> str:
+    """
+    Brief description:
+        Build one journal line for a purchase.
+
+    Parameters (name: type):
+        seq (int): Sequence number of the purchase.
+        requested (int): Tickets bought in the purchase.
+
+    Variables (name: type):
+        body (str): The "seq requested" part of the line.
+        checksum (int): CRC32 of body, used to detect torn writes.
+
+    Logical steps:
+        1. Join seq and requested into the body.
+        2. Compute a checksum of the body.
+        3. Return the body, checksum, and a newline.
+
+    Return:
+        str: The encoded journal line.
+    """
+    body = f"{seq} {requested}"
+    checksum = zlib.crc32(body.encode("ascii"))
+    return f"{body} {checksum}\n"
+
+
+def decode_record(line: str) -> Optional[Tuple[int, int]]:
+    """
+    Brief description:
+        Parse one journal line, rejecting incomplete or corrupt lines.
+
+    Parameters (name: type):
+        line (str): A line read from the journal file.
+
+    Variables (name: type):
+        parts (list[str]): The whitespace separated fields of the line.
+        body (str): The "seq requested" part of the line.
+
+    Logical steps:
+        1. Reject lines that do not end in a newline (torn write).
+        2. Reject lines without exactly three integer fields.
+        3. Reject lines whose checksum does not match.
+        4. Return the sequence number and ticket count.
+
+    Return:
+        tuple[int, int] | None: (seq, requested), or None if the line is bad.
+    """
+    # A crash in the middle of a write leaves a line with no newline.
+    if not line.endswith("\n"):
+        return None
+
+    parts = line.split()
+    if len(parts) != 3 or not all(p.isdigit() for p in parts):
+        return None
+
+    body = f"{parts[0]} {parts[1]}"
+    if zlib.crc32(body.encode("ascii")) != int(parts[2]):
+        return None
+
+    return int(parts[0]), int(parts[1])
+
+
+def fsync_directory(directory: str) -> None:
+    """
+    Brief description:
+        Make renames and new names in a directory durable.
+
+    Parameters (name: type):
+        directory (str): The directory to sync.
+
+    Variables (name: type):
+        fd (int): Read-only descriptor for the directory.
+
+    Logical steps:
+        1. Skip on Windows, which cannot open directories this way.
+        2. Open the directory read-only, fsync it, and close it.
+
+    Return:
+        None
+    """
+    if os.name == "nt":
+        return
+
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class PurchaseJournal:
+    """
+    Brief description:
+        Append-only, group-committed purchase log with periodic snapshots.
+
+    Attributes (name: type):
+        tickets_remaining (int): Tickets still available after all purchases.
+        total_buyers (int): Number of purchases recorded so far.
+        seq (int): Sequence number of the last recorded purchase.
+        durable_seq (int): Sequence number of the last purchase on disk.
+        replayed (int): Journal lines applied on top of the snapshot at open.
+        commits (int): Number of fsyncs done by commit().
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        tickets_remaining: int,
+        total_buyers: int = 0,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+    ) -> None:
+        """
+        Brief description:
+            Open (or create) a journal and recover the sale counters from it.
+
+        Parameters (name: type):
+            directory (str): Folder that holds the snapshot and journal files.
+            tickets_remaining (int): Starting tickets when no snapshot exists.
+            total_buyers (int): Starting buyer count when no snapshot exists.
+            batch_size (int): Buffered purchases that force a commit.
+            snapshot_every (int): Committed purchases between snapshots.
+
+        Logical steps:
+            1. Create the directory if needed.
+            2. Recover the counters from the snapshot and journal tail.
+            3. Open the journal for appending.
+
+        Return:
+            None
+        """
+        self.directory = directory
+        self.batch_size = max(1, batch_size)
+        self.snapshot_every = max(1, snapshot_every)
+
+        self.tickets_remaining = tickets_remaining
+        self.total_buyers = total_buyers
+        self.seq = 0
+        self.durable_seq = 0
+        self.replayed = 0
+        self.commits = 0
+
+        # _buffer_lock guards the counters and pending lines; _commit_lock
+        # makes sure only one thread writes and fsyncs at a time.
+        self._buffer_lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._buffer: List[str] = []
+        self._since_snapshot = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._journal_path = os.path.join(directory, JOURNAL_FILE)
+
+        self._recover()
+        self._file = open(self._journal_path, "a", encoding="ascii")
+
+    def _recover(self) -> None:
+        """
+        Brief description:
+            Load the last snapshot and replay only the journal tail after it.
+
+        Variables (name: type):
+            good_offset (int): Byte offset just past the last valid line.
+            record (tuple[int, int] | None): The decoded journal line.
+
+        Logical steps:
+            1. Load counters and sequence number from the snapshot, if any.
+            2. Read journal lines until the first bad line.
+            3. Apply each purchase newer than the snapshot.
+            4. Cut off any torn or corrupt tail so new lines append cleanly.
+
+        Return:
+            None
+        """
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding="utf-8") as snapshot:
+                state = json.load(snapshot)
+            self.seq = state["seq"]
+            self.tickets_remaining = state["tickets_remaining"]
+            self.total_buyers = state["total_buyers"]
+
+        if not os.path.exists(self._journal_path):
+            self.durable_seq = self.seq
+            return
+
+        good_offset = 0
+        with open(self._journal_path, "rb") as journal:
+            for raw in journal:
+                record = decode_record(raw.decode("ascii", errors="replace"))
+                if record is None:
+                    break
+                good_offset += len(raw)
+
+                seq, requested = record
+                # Lines at or below the snapshot were already folded into it.
+                if seq <= self.seq:
+                    continue
+                self.seq = seq
+                self.tickets_remaining -= requested
+                self.total_buyers += 1
+                self._since_snapshot += 1
+                self.replayed += 1
+
+        if good_offset != os.path.getsize(self._journal_path):
+            with open(self._journal_path, "r+b") as journal:
+                journal.truncate(good_offset)
+                os.fsync(journal.fileno())
+
+        self.durable_seq = self.seq
+
+    def record_purchase(self, requested: int, wait: bool = True) -> int:
+        """
+        Brief description:
+            Record one purchase and update the journal's counters.
+
+        Parameters (name: type):
+            requested (int): Tickets bought (already validated).
+            wait (bool): If True, return only after the purchase is on disk.
+
+        Variables (name: type):
+            seq (int): Sequence number given to this purchase.
+            batch_full (bool): Whether the pending buffer reached batch_size.
+
+        Logical steps:
+            1. Assign a sequence number and update the counters.
+            2. Add the encoded line to the pending buffer.
+            3. Commit if the caller waits or the buffer is full.
+            4. Return the sequence number.
+
+        Return:
+            int: The sequence number of the purchase.
+        """
+        with self._buffer_lock:
+            self.seq += 1
+            seq = self.seq
+            self.tickets_remaining -= requested
+            self.total_buyers += 1
+            self._buffer.append(encode_record(seq, requested))
+            batch_full = len(self._buffer) >= self.batch_size
+
+        if wait or batch_full:
+            self.commit(seq if wait else None)
+
+        return seq
+
+    def commit(self, upto: Optional[int] = None) -> None:
+        """
+        Brief description:
+            Write all pending purchases and make them durable with one fsync.
+
+        Parameters (name: type):
+            upto (int | None): Skip the write if this seq is already durable.
+
+        Variables (name: type):
+            pending (list[str]): Lines taken from the buffer for this commit.
+            last_seq (int): Sequence number of the last pending line.
+            state (tuple[int, int]): Counters matching last_seq.
+
+        Logical steps:
+            1. Take the commit lock; return early if another thread already
+               committed the caller's purchase (group commit).
+            2. Swap out the pending buffer together with matching counters.
+            3. Write, flush, and fsync the lines.
+            4. Take a snapshot when enough purchases have been committed.
+
+        Return:
+            None
+        """
+        with self._commit_lock:
+            if upto is not None and self.durable_seq >= upto:
+                return
+
+            with self._buffer_lock:
+                pending = self._buffer
+                self._buffer = []
+                last_seq = self.seq
+                state = (self.tickets_remaining, self.total_buyers)
+
+            if not pending:
+                return
+
+            self._file.write("".join(pending))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.durable_seq = last_seq
+            self.commits += 1
+
+            self._since_snapshot += len(pending)
+            if self._since_snapshot >= self.snapshot_every:
+                self._write_snapshot(last_seq, state)
+
+    def _write_snapshot(self, seq: int, state: Tuple[int, int]) -> None:
+        """
+        Brief description:
+            Atomically save the counters and empty the journal.
+
+        Parameters (name: type):
+            seq (int): Last purchase folded into the snapshot.
+            state (tuple[int, int]): (tickets_remaining, total_buyers).
+
+        Variables (name: type):
+            temp_path (str): Temporary file renamed over the old snapshot.
+
+        Logical steps:
+            1. Write the snapshot to a temporary file and fsync it.
+            2. Rename it over the old snapshot (atomic on POSIX and Windows).
+            3. Fsync the directory so the rename itself survives a power
+               loss; otherwise the old snapshot could come back next to an
+               empty journal and confirmed purchases would be lost.
+            4. Truncate the journal and fsync it. Replay skips anything the
+               snapshot covers, so a crash between steps 3 and 4 is harmless.
+
+        Return:
+            None
+        """
+        temp_path = self._snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as snapshot:
+            json.dump(
+                {"seq": seq, "tickets_remaining": state[0], "total_buyers": state[1]},
+                snapshot,
+            )
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temp_path, self._snapshot_path)
+        fsync_directory(self.directory)
+
+        self._file.truncate(0)
+        os.fsync(self._file.fileno())
+        self._since_snapshot = 0
+
+    def close(self) -> None:
+        """Commit anything still pending and close the journal file."""
+        self.commit()
+        self._file.close()
+
+    def __enter__(self) -> "PurchaseJournal":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def check_recovery() -> List[str]:
+    """
+    Brief description:
+        Simulate crashes in scratch directories and check that recovery
+        restores exactly the committed purchases.
+
+    Variables (name: type):
+        failures (list[str]): Descriptions of failed checks.
+        directory (str): Scratch journal directory for one scenario.
+        saved (bytes): Journal contents kept to fake an unfinished truncate.
+
+    Logical steps:
+        1. Torn tail: a half-written last line is ignored and cut off, and
+           new purchases append cleanly after it.
+        2. Snapshot then tail: only the lines after the snapshot are replayed.
+        3. Crash between the snapshot rename and the journal truncate: the
+           old lines are skipped, not counted twice.
+        4. Return the list of failed checks (empty if all passed).
+
+    Return:
+        list[str]: An empty list if every scenario recovered correctly.
+    """
+    import tempfile
+
+    failures: List[str] = []
+
+    def reopen(directory: str) -> PurchaseJournal:
+        # Recover, then release the file; the counters stay readable.
+        journal = PurchaseJournal(directory, 100)
+        journal.close()
+        return journal
+
+    def expect(label: str, journal: PurchaseJournal, buyers: int, replayed: int) -> None:
+        if journal.total_buyers != buyers or journal.tickets_remaining != 100 - buyers:
+            failures.append(f"{label}: recovered {journal.total_buyers} buyers and "
+                            f"{journal.tickets_remaining} tickets, expected {buyers} and {100 - buyers}")
+        if journal.replayed != replayed:
+            failures.append(f"{label}: replayed {journal.replayed} lines, expected {replayed}")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = os.path.join(scratch, "torn")
+        with PurchaseJournal(directory, 100, batch_size=1) as journal:
+            for _ in range(5):
+                journal.record_purchase(1)
+        with open(os.path.join(directory, JOURNAL_FILE), "a", encoding="ascii") as log:
+            # A complete record whose newline never reached the disk.
+            log.write(encode_record(6, 1).rstrip("\n"))
+        expect("torn tail", reopen(directory), 5, 5)
+        with PurchaseJournal(directory, 100, batch_size=1) as journal:
+            journal.record_purchase(1)
+        expect("torn tail, after append", reopen(directory), 6, 6)
+
+        directory = os.path.join(scratch, "tail")
+        with PurchaseJournal(directory, 100, batch_size=1, snapshot_every=4) as journal:
+            for _ in range(6):
+                journal.record_purchase(1)
+        expect("snapshot then tail", reopen(directory), 6, 2)
+
+        directory = os.path.join(scratch, "unfinished")
+        journal = PurchaseJournal(directory, 100, batch_size=1)
+        for _ in range(3):
+            journal.record_purchase(1)
+        with open(os.path.join(directory, JOURNAL_FILE), "rb") as log:
+            saved = log.read()
+        journal._write_snapshot(journal.durable_seq, (journal.tickets_remaining, journal.total_buyers))
+        journal.close()
+        with open(os.path.join(directory, JOURNAL_FILE), "wb") as log:
+            log.write(saved)
+        expect("crash before truncate", reopen(directory), 3, 0)
+
+    return failures
+
+
+if __name__ == "__main__":
+    # Run the crash-recovery self-check: python ticket_purchase_journal.py
+    problems = check_recovery()
+    for problem in problems:
+        print(f"RECOVERY CHECK FAILED: {problem}")
+    print("Recovery checks: " + ("FAILED" if problems else "OK"))
+    raise SystemExit(1 if problems else 0)
@@ -0,0 +1,537 @@
+"""
+Ticket Sale Load Generator
+
+Program Description:
+    This program simulates many buyers hitting the cinema pre-sale at the
+    same time, using either threads or processes. Each simulated buyer
+    draws a request size from a configurable distribution, validates it
+    with check_ticket_request, and applies it with apply_purchase while
+    holding a shared lock. The program reports purchases per second,
+    latency percentiles, lock contention, and checks that the sale was
+    never oversold and that the buyer counter matches the purchases made.
+    It also replays a scripted sale through main() to check its
+    total_buyers accumulator against the known number of purchases.
+
+    With --journal-dir, the threads run is repeated with every purchase
+    recorded through PurchaseJournal (group commit: each buyer waits until
+    its purchase is on disk, and one fsync covers every buyer waiting at
+    that moment). The report shows the added latency, how many purchases
+    each fsync covered, and whether a reopened journal recovers the same
+    counters.
+
+Usage:
+    python ticket_sale_benchmark.py --mode both --workers 8 --tickets 200000
+    python ticket_sale_benchmark.py --mode threads --tickets 20000 --journal-dir /var/tmp
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from AngelicaMunozProgrammingExercise1 import (
+    MAX_PER_BUYER,
+    apply_purchase,
+    check_ticket_request,
+    main,
+)
+from ticket_purchase_journal import PurchaseJournal
+
+
+# Relative weights for request sizes 1..max_per_buyer.
+DISTRIBUTIONS: Dict[str, Callable[[int], List[int]]] = {
+    "uniform": lambda size: [1] * size,
+    "singles": lambda size: [1] + [0] * (size - 1),
+    "small": lambda size: list(range(size, 0, -1)),
+    "large": lambda size: list(range(1, size + 1)),
+}
+
+
+def run_buyer(
+    worker_id: int,
+    remaining,
+    buyers,
+    lock,
+    distribution: str,
+    max_per_buyer: int,
+    seed: int,
+    journal: Optional[PurchaseJournal] = None,
+) -> Dict[str, object]:
+    """
+    Brief description:
+        Buy tickets as one simulated buyer stream until the sale sells out.
+
+    Parameters (name: type):
+        worker_id (int): Index of this worker, used to vary the seed.
+        remaining (ctypes int): Shared tickets_remaining counter.
+        buyers (ctypes int): Shared total_buyers counter.
+        lock (Lock): Lock that guards both counters.
+        distribution (str): Key into DISTRIBUTIONS.
+        max_per_buyer (int): Largest request size to draw.
+        seed (int): Base random seed.
+        journal (PurchaseJournal | None): If given, each purchase is made
+            durable here (outside the sale lock) before it counts as done.
+
+    Variables (name: type):
+        sizes (list[int]): Possible request sizes.
+        weights (list[int]): Relative weight of each size.
+        latencies (list[float]): Seconds per purchase attempt.
+        purchases (int): Purchases this worker completed (ground truth).
+        tickets (int): Tickets this worker bought (ground truth).
+        largest (int): Most tickets this worker bought in one purchase.
+        rejected (int): Requests rejected by check_ticket_request.
+        contended (int): Lock acquisitions that had to wait.
+        lock_wait (float): Total seconds spent waiting for the lock.
+        oversold (bool): Whether tickets_remaining was ever seen below 0.
+
+    Logical steps:
+        1. Draw a request size.
+        2. Try the lock without blocking; count a contention if it is busy.
+        3. Stop if sold out; otherwise validate and apply the purchase.
+        4. If the request is rejected, retry once with min(requested,
+           remaining), as a real buyer would after seeing the error message;
+           the retry goes through check_ticket_request too, and only an
+           accepted request is applied.
+        5. Journal the purchase, if enabled, then record latency and repeat.
+
+    Return:
+        dict[str, object]: Per-worker statistics.
+    """
+    rng = random.Random(seed + worker_id)
+    sizes = list(range(1, max_per_buyer + 1))
+    weights = DISTRIBUTIONS[distribution](max_per_buyer)
+
+    latencies: List[float] = []
+    purchases = 0
+    tickets = 0
+    largest = 0
+    rejected = 0
+    contended = 0
+    lock_wait = 0.0
+    oversold = False
+
+    while True:
+        requested = rng.choices(sizes, weights)[0]
+        start = time.perf_counter()
+
+        # A failed non-blocking acquire means another buyer holds the lock.
+        if not lock.acquire(False):
+            contended += 1
+            lock.acquire()
+        lock_wait += time.perf_counter() - start
+
+        try:
+            current = remaining.value
+            if current <= 0:
+                break
+
+            checked, _, _ = check_ticket_request(str(requested), current)
+            if checked is None:
+                rejected += 1
+                checked, _, _ = check_ticket_request(str(min(requested, current)), current)
+                if checked is None:
+                    # Still outside 1-MAX_PER_BUYER (--max-per-buyer set too high).
+                    rejected += 1
+                    continue
+
+            remaining.value = apply_purchase(current, checked)
+            buyers.value += 1
+            oversold = oversold or remaining.value < 0
+        finally:
+            lock.release()
+
+        if journal is not None:
+            journal.record_purchase(checked)
+
+        purchases += 1
+        tickets += checked
+        largest = max(largest, checked)
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "latencies": latencies,
+        "purchases": purchases,
+        "tickets": tickets,
+        "largest": largest,
+        "rejected": rejected,
+        "contended": contended,
+        "lock_wait": lock_wait,
+        "oversold": oversold,
+    }
+
+
+def _process_buyer(queue, *args) -> None:
+    """Run run_buyer in a child process and send its statistics back."""
+    queue.put(run_buyer(*args))
+
+
+def run_load(
+    mode: str,
+    workers: int,
+    total_tickets: int,
+    distribution: str,
+    max_per_buyer: int,
+    seed: int,
+    journal: Optional[PurchaseJournal] = None,
+) -> Tuple[float, List[Dict[str, object]], int, int]:
+    """
+    Brief description:
+        Run all simulated buyers against one shared pair of counters.
+
+    Parameters (name: type):
+        mode (str): "threads" or "processes".
+        workers (int): Number of concurrent buyer streams.
+        total_tickets (int): Tickets on sale.
+        distribution (str): Key into DISTRIBUTIONS.
+        max_per_buyer (int): Largest request size to draw.
+        seed (int): Base random seed.
+        journal (PurchaseJournal | None): Purchase journal (threads mode only).
+
+    Variables (name: type):
+        remaining (ctypes int): Shared tickets_remaining counter.
+        buyers (ctypes int): Shared total_buyers counter.
+        results (list[dict]): Statistics from each worker.
+
+    Logical steps:
+        1. Create shared counters and a lock suited to the mode.
+        2. Start the workers and wait for them to finish.
+        3. Return elapsed time, worker results, and final counter values.
+
+    Return:
+        tuple[float, list[dict], int, int]: (elapsed, results, remaining, buyers)
+    """
+    remaining = multiprocessing.RawValue("q", total_tickets)
+    buyers = multiprocessing.RawValue("q", 0)
+    results: List[Dict[str, object]] = []
+
+    if mode == "threads":
+        lock = threading.Lock()
+
+        def thread_buyer(worker_id: int) -> None:
+            results.append(run_buyer(
+                worker_id, remaining, buyers, lock, distribution, max_per_buyer, seed, journal,
+            ))
+
+        runners = [threading.Thread(target=thread_buyer, args=(i,)) for i in range(workers)]
+    else:
+        lock = multiprocessing.Lock()
+        queue = multiprocessing.Queue()
+        runners = [
+            multiprocessing.Process(
+                target=_process_buyer,
+                args=(queue, i, remaining, buyers, lock, distribution, max_per_buyer, seed),
+            )
+            for i in range(workers)
+        ]
+
+    start = time.perf_counter()
+    for runner in runners:
+        runner.start()
+
+    if mode != "threads":
+        # Drain the queue before joining so large results cannot block exit.
+        results = [queue.get() for _ in runners]
+
+    for runner in runners:
+        runner.join()
+    elapsed = time.perf_counter() - start
+
+    return elapsed, results, remaining.value, buyers.value
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Return the value at the given fraction of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def check_invariants(
+    total_tickets: int,
+    results: List[Dict[str, object]],
+    final_remaining: int,
+    final_buyers: int,
+) -> List[str]:
+    """
+    Brief description:
+        Compare the shared counters against the workers' own tallies.
+
+    Parameters (name: type):
+        total_tickets (int): Tickets on sale.
+        results (list[dict]): Statistics from each worker.
+        final_remaining (int): tickets_remaining after the run.
+        final_buyers (int): total_buyers after the run.
+
+    Variables (name: type):
+        purchases (int): Sum of purchases counted by the workers.
+        tickets (int): Sum of tickets bought by the workers.
+        largest (int): Largest single purchase across all workers.
+        failures (list[str]): Descriptions of broken invariants.
+
+    Logical steps:
+        1. Check that no worker ever saw a negative ticket count.
+        2. Check that the sale sold out exactly.
+        3. Check that tickets bought plus remaining equals total_tickets.
+        4. Check that total_buyers equals the number of purchases.
+        5. Check that no purchase was larger than MAX_PER_BUYER.
+
+    Return:
+        list[str]: An empty list if every invariant holds.
+    """
+    purchases = sum(r["purchases"] for r in results)
+    tickets = sum(r["tickets"] for r in results)
+    failures: List[str] = []
+
+    if any(r["oversold"] for r in results) or final_remaining < 0:
+        failures.append("oversold: tickets_remaining went below 0")
+    if final_remaining != 0:
+        failures.append(f"not sold out: {final_remaining} tickets left")
+    if tickets + final_remaining != total_tickets:
+        failures.append(f"ticket count mismatch: sold {tickets}, "
+                        f"remaining {final_remaining}, total {total_tickets}")
+    if final_buyers != purchases:
+        failures.append(f"total_buyers is {final_buyers}, expected {purchases}")
+    largest = max((r["largest"] for r in results), default=0)
+    if largest > MAX_PER_BUYER:
+        failures.append(f"a purchase of {largest} tickets exceeded MAX_PER_BUYER ({MAX_PER_BUYER})")
+
+    return failures
+
+
+def run_journaled_load(
+    journal_root: str,
+    workers: int,
+    total_tickets: int,
+    distribution: str,
+    max_per_buyer: int,
+    seed: int,
+) -> Tuple[float, List[Dict[str, object]], List[str], str]:
+    """
+    Brief description:
+        Run the threads load with every purchase recorded in a fresh journal.
+
+    Parameters (name: type):
+        journal_root (str): Folder in which a scratch journal is created.
+        workers (int): Number of concurrent buyer threads.
+        total_tickets (int): Tickets on sale.
+        distribution (str): Key into DISTRIBUTIONS.
+        max_per_buyer (int): Largest request size to draw.
+        seed (int): Base random seed.
+
+    Variables (name: type):
+        directory (str): Scratch journal directory, removed afterwards.
+        journal (PurchaseJournal): Journal shared by all buyer threads.
+        recovered (PurchaseJournal): The journal reopened after the run.
+        failures (list[str]): Broken invariants, including recovery checks.
+
+    Logical steps:
+        1. Create a scratch journal directory and open the journal.
+        2. Run the threads load with the journal.
+        3. Check the usual invariants, then reopen the journal and check it
+           recovers the same tickets_remaining and total_buyers.
+        4. Describe the group commit (purchases per fsync) and clean up.
+
+    Return:
+        tuple[float, list[dict], list[str], str]:
+            (elapsed, results, failures, group-commit summary line)
+    """
+    os.makedirs(journal_root, exist_ok=True)
+    directory = tempfile.mkdtemp(prefix="presale-journal-", dir=journal_root)
+    try:
+        journal = PurchaseJournal(directory, total_tickets, 0)
+        try:
+            elapsed, results, remaining, buyers = run_load(
+                "threads", workers, total_tickets, distribution, max_per_buyer, seed, journal,
+            )
+        finally:
+            journal.close()
+
+        failures = check_invariants(total_tickets, results, remaining, buyers)
+        recovered = PurchaseJournal(directory, total_tickets, 0)
+        recovered.close()
+        if (recovered.tickets_remaining, recovered.total_buyers) != (remaining, buyers):
+            failures.append(f"journal recovered {recovered.tickets_remaining} tickets and "
+                            f"{recovered.total_buyers} buyers, expected {remaining} and {buyers}")
+
+        summary = (f"Journal: {journal.total_buyers} purchases in {journal.commits} fsyncs "
+                   f"({journal.total_buyers / max(1, journal.commits):.1f} purchases per fsync)")
+        return elapsed, results, failures, summary
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def check_main_accumulator(requests: List[int]) -> List[str]:
+    """
+    Brief description:
+        Replay a scripted sale through main() and check its buyer total.
+
+    Parameters (name: type):
+        requests (list[int]): Ticket counts entered by successive buyers;
+            they must sell out exactly TOTAL_TICKETS.
+
+    Variables (name: type):
+        output (io.StringIO): Captured console output from main().
+        match (re.Match | None): The "Total number of total_buyers" line.
+
+    Logical steps:
+        1. Feed the requests to main() as standard input.
+        2. Capture what main() prints.
+        3. Compare the reported buyer total with len(requests).
+
+    Return:
+        list[str]: An empty list if main() reported the correct total.
+    """
+    output = io.StringIO()
+    stdin = sys.stdin
+    sys.stdin = io.StringIO("".join(f"{r}\n" for r in requests))
+    try:
+        with contextlib.redirect_stdout(output):
+            main()
+    finally:
+        sys.stdin = stdin
+
+    match = re.search(r"total_buyers: (\d+)", output.getvalue())
+    if match is None:
+        return ["main() did not report a buyer total"]
+    if int(match.group(1)) != len(requests):
+        return [f"main() reported {match.group(1)} buyers, expected {len(requests)}"]
+    return []
+
+
+def report(
+    mode: str,
+    elapsed: float,
+    results: List[Dict[str, object]],
+    failures: List[str],
+) -> None:
+    """
+    Brief description:
+        Print throughput, latency, contention, and invariant results.
+
+    Parameters (name: type):
+        mode (str): "threads" or "processes".
+        elapsed (float): Wall-clock seconds for the run.
+        results (list[dict]): Statistics from each worker.
+        failures (list[str]): Broken invariants, if any.
+
+    Variables (name: type):
+        latencies (list[float]): All purchase latencies, sorted.
+        purchases (int): Total purchases.
+        contended (int): Total contended lock acquisitions.
+
+    Logical steps:
+        1. Merge the workers' statistics.
+        2. Print throughput, percentiles, and contention.
+        3. Print the invariant check result.
+
+    Return:
+        None
+    """
+    latencies = sorted(lat for r in results for lat in r["latencies"])
+    purchases = sum(r["purchases"] for r in results)
+    contended = sum(r["contended"] for r in results)
+    lock_wait = sum(r["lock_wait"] for r in results)
+    rejected = sum(r["rejected"] for r in results)
+
+    print(f"\n--- {mode} ---")
+    print(f"Purchases: {purchases} in {elapsed:.3f}s "
+          f"({purchases / elapsed if elapsed else 0:,.0f} purchases/sec)")
+    print("Latency (us): "
+          f"p50 {percentile(latencies, 0.50) * 1e6:.1f}  "
+          f"p99 {percentile(latencies, 0.99) * 1e6:.1f}  "
+          f"p99.9 {percentile(latencies, 0.999) * 1e6:.1f}  "
+          f"max {(latencies[-1] if latencies else 0) * 1e6:.1f}")
+    print(f"Lock contention: {contended} of {purchases + len(results)} acquisitions waited "
+          f"({lock_wait:.3f}s total wait)")
+    print(f"Requests rejected: {rejected}")
+
+    if failures:
+        for failure in failures:
+            print(f"INVARIANT FAILED: {failure}")
+    else:
+        print("Invariants: OK (never oversold, total_buyers matches purchases, no purchase over MAX_PER_BUYER)")
+
+
+def run_benchmark() -> None:
+    """
+    Brief description:
+        Parse command-line options and run the requested load tests.
+
+    Variables (name: type):
+        args (argparse.Namespace): Parsed command-line options.
+        modes (list[str]): Modes to run.
+        failed (bool): Whether any invariant failed.
+
+    Logical steps:
+        1. Parse options.
+        2. Check main()'s total_buyers accumulator on a scripted sale.
+        3. Run each mode, check invariants, and print a report.
+        4. With --journal-dir, repeat the threads run with a journal and
+           report the latency it adds.
+        5. Exit with status 1 if any invariant failed.
+
+    Return:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Load test the ticket pre-sale path.")
+    parser.add_argument("--mode", choices=["threads", "processes", "both"], default="both")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--tickets", type=int, default=200_000)
+    parser.add_argument("--distribution", choices=sorted(DISTRIBUTIONS), default="uniform")
+    parser.add_argument("--max-per-buyer", type=int, default=MAX_PER_BUYER)
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--journal-dir",
+                        help="also run threads with a purchase journal in this folder")
+    args = parser.parse_args()
+
+    if args.journal_dir and args.mode == "processes":
+        parser.error("--journal-dir needs threads mode (--mode threads or both)")
+
+    modes = ["threads", "processes"] if args.mode == "both" else [args.mode]
+
+    # 4 + 4 + 2 sells out TOTAL_TICKETS (10) with three buyers.
+    failures = check_main_accumulator([4, 4, 2])
+    print("main() total_buyers accumulator: " + ("; ".join(failures) or "OK"))
+    failed = bool(failures)
+
+    for mode in modes:
+        elapsed, results, remaining, buyers = run_load(
+            mode, args.workers, args.tickets, args.distribution, args.max_per_buyer, args.seed,
+        )
+        failures = check_invariants(args.tickets, results, remaining, buyers)
+        report(mode, elapsed, results, failures)
+        failed = failed or bool(failures)
+        if mode == "threads":
+            plain_latencies = sorted(lat for r in results for lat in r["latencies"])
+
+    if args.journal_dir:
+        elapsed, results, failures, summary = run_journaled_load(
+            args.journal_dir, args.workers, args.tickets, args.distribution,
+            args.max_per_buyer, args.seed,
+        )
+        report("threads + journal", elapsed, results, failures)
+        print(summary)
+        journaled = sorted(lat for r in results for lat in r["latencies"])
+        print("Journal latency cost (us): "
+              f"p50 +{(percentile(journaled, 0.50) - percentile(plain_latencies, 0.50)) * 1e6:.1f}  "
+              f"p99 +{(percentile(journaled, 0.99) - percentile(plain_latencies, 0.99)) * 1e6:.1f}")
+        failed = failed or bool(failures)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_benchmark()